@@ -1,10 +1,14 @@
 import os
 import argparse
-import glob
+import asyncio
 import subprocess
-import json
 import logging
-from tqdm import tqdm
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(
@@ -14,22 +18,130 @@ logging.basicConfig(
 )
 logger = logging.getLogger('youtube-transcriber')
 
-def download_playlist(playlist_url, output_dir):
+# Matches a "[VIDEO_ID].mp4" file name suffix, as produced by yt-dlp's default output template
+# (this script's own downloads are named by title and are tracked through the download archive)
+_YT_ID_RE = re.compile(r'\[([A-Za-z0-9_-]{11})\]\.mp4\Z')
+
+def _read_download_archive(archive_path):
+    """
+    Read the video IDs recorded in a yt-dlp download archive.
+    
+    Args:
+        archive_path (str): Path of the yt-dlp download archive
+    
+    Returns:
+        set: IDs of the videos yt-dlp has already downloaded
+    """
+    try:
+        with open(archive_path, 'r', encoding='utf-8') as f:
+            # Each line looks like "youtube VIDEO_ID"
+            return {parts[1] for parts in (line.split() for line in f) if len(parts) == 2}
+    except FileNotFoundError:
+        return set()
+
+def _index_existing_videos(output_dir):
+    """
+    Scan the output directory once and map YouTube video IDs to downloaded files.
+    
+    Only files whose name ends in "[VIDEO_ID].mp4" can be indexed. This script saves
+    videos by title, so this only finds files downloaded with yt-dlp's default template.
+    
+    Args:
+        output_dir (str): Directory where videos are saved
+    
+    Returns:
+        dict: Mapping of video ID to video file path
+    """
+    existing_videos = {}
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            match = _YT_ID_RE.search(entry.name)
+            if match:
+                existing_videos[match.group(1)] = entry.path
+    return existing_videos
+
+async def _download_video(video, index, total, output_dir, archive_path, semaphore):
+    """
+    Download a single playlist entry with yt-dlp, limited by a shared semaphore.
+    
+    Args:
+        video (dict): Playlist entry as returned by yt-dlp --flat-playlist
+        index (int): Position of the video in the playlist (0-based)
+        total (int): Number of videos in the playlist
+        output_dir (str): Directory where the video will be saved
+        archive_path (str): Path of the yt-dlp download archive
+        semaphore (asyncio.Semaphore): Limits the number of concurrent downloads
+    
+    Returns:
+        str: Path to the video file, or None if it failed or yt-dlp skipped it through the archive
+    """
+    video_id = video.get('id')
+    video_title = video.get('title', video_id)
+    video_url = f"https://www.youtube.com/watch?v={video_id}"
+    
+    # Format template for output filename
+    output_template = os.path.join(output_dir, f"%(title)s.%(ext)s")
+    
+    async with semaphore:
+        try:
+            logger.info(f"Downloading video {index+1}/{total}: {video_title}")
+            
+            # Command to download video. Videos listed in the archive are skipped by yt-dlp itself
+            cmd = [
+                'yt-dlp',
+                '-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
+                '--merge-output-format', 'mp4',
+                '-N', '4',
+                '--download-archive', archive_path,
+                '--print', 'after_move:filepath',
+                '-o', output_template,
+                '--no-playlist',
+                video_url
+            ]
+            
+            # Run download command
+            process = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+            if process.returncode != 0:
+                logger.error(f"Error downloading video {video_id}: yt-dlp exited with code {process.returncode}")
+                logger.error(f"Error output: {stderr.decode(errors='replace')}")
+                return None
+            
+            # yt-dlp prints the final path once the file is in place, nothing if the archive skipped it
+            printed_paths = stdout.decode(errors='replace').splitlines()
+            if not printed_paths:
+                logger.info(f"Skipping video {index+1}/{total}: {video_title} (already in download archive)")
+                return None
+            
+            logger.info(f"Successfully downloaded: {video_title}")
+            return printed_paths[-1].strip()
+        except Exception as e:
+            logger.error(f"Unexpected error downloading video {video_id}: {e}")
+    return None
+
+async def download_playlist(playlist_url, output_dir, max_concurrent_downloads=4):
     """
     Download all videos from a YouTube playlist to the specified output directory using yt-dlp.
     Skip videos that have already been downloaded.
     
+    Skipped videos recorded only in the download archive have no known file path, so they are
+    not part of the returned list.
+    
     Args:
         playlist_url (str): URL of the YouTube playlist
         output_dir (str): Directory where videos will be saved
+        max_concurrent_downloads (int): Maximum number of videos downloaded at the same time
     
     Returns:
-        list: List of paths to downloaded video files
+        list: Paths of the videos downloaded in this run, plus already downloaded videos whose
+            file name contains their ID
     """
+    import orjson
+    
     # Create output directory if it doesn't exist
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        logger.info(f"Created output directory: {output_dir}")
+    os.makedirs(output_dir, exist_ok=True)
         
     # Get playlist info
     logger.info(f"Getting playlist info for: {playlist_url}")
@@ -42,235 +154,356 @@ def download_playlist(playlist_url, output_dir):
     ]
     
     try:
-        # Run command and capture output
-        playlist_info = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        videos = [json.loads(line) for line in playlist_info.stdout.strip().split('\n') if line]
+        # Parse each entry as yt-dlp prints it instead of buffering the whole dump
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, limit=1024 * 1024
+        )
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        videos = [orjson.loads(line) async for line in process.stdout if line.strip()]
+        stderr = await stderr_task
+        if await process.wait() != 0:
+            logger.error(f"Error getting playlist info: yt-dlp exited with code {process.returncode}")
+            logger.error(f"Error output: {stderr.decode(errors='replace')}")
+            return []
         logger.info(f"Found {len(videos)} videos in playlist")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error getting playlist info: {e}")
-        logger.error(f"Error output: {e.stderr}")
-        return []
     except Exception as e:
         logger.error(f"Unexpected error getting playlist info: {e}")
         return []
-        
-    video_paths = []
     
-    # Download each video
+    # yt-dlp records finished video IDs here and skips them on later runs
+    archive_path = os.path.join(output_dir, '.yt-dlp-archive.txt')
+    archived_ids = _read_download_archive(archive_path)
+    existing_videos = _index_existing_videos(output_dir)
+    
+    # Skip already downloaded videos without starting a yt-dlp process for them
+    video_paths = []
+    videos_to_download = []
     for i, video in enumerate(videos):
         video_id = video.get('id')
-        video_title = video.get('title', video_id)
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
-        
-        # Format template for output filename
-        output_template = os.path.join(output_dir, f"%(title)s.%(ext)s")
-        
-        try:
-            # Check if file already exists before downloading
-            # First get the expected filename
-            expected_filename = subprocess.run(
-                ['yt-dlp', '--print', 'filename', '-o', output_template, '--no-download', video_url],
-                capture_output=True, text=True, check=True
-            ).stdout.strip()
-            
-            # Also check for any files with the video ID in the name
-            existing_files = glob.glob(os.path.join(output_dir, f"*{video_id}*.mp4"))
-            
-            if os.path.exists(expected_filename) or existing_files:
-                # File already exists, skip download
-                logger.info(f"Skipping video {i+1}/{len(videos)}: {video_title} (already downloaded)")
-                
-                if os.path.exists(expected_filename):
-                    video_paths.append(expected_filename)
-                else:
-                    video_paths.append(existing_files[0])
-                continue
-                
-            logger.info(f"Downloading video {i+1}/{len(videos)}: {video_title}")
-            
-            # Command to download video
-            cmd = [
-                'yt-dlp',
-                '-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
-                '--merge-output-format', 'mp4',
-                '-o', output_template,
-                '--no-playlist',
-                video_url
-            ]
-            
-            # Run download command
-            subprocess.run(cmd, check=True)
-            
-            logger.info(f"Successfully downloaded: {video_title}")
-
-            # Find the downloaded file
-            if os.path.exists(expected_filename):
-                video_paths.append(expected_filename)
-            else:
-                # Try to find any file with the video ID in the name
-                possible_files = glob.glob(os.path.join(output_dir, f"*{video_id}*.mp4"))
-                if possible_files:
-                    video_paths.append(possible_files[0])
-                    
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error downloading video {video_id}: {e}")
-            logger.error(f"Error output: {e.stderr}")
-        except Exception as e:
-            logger.error(f"Unexpected error downloading video {video_id}: {e}")
+        if video_id in archived_ids or video_id in existing_videos:
+            logger.info(f"Skipping video {i+1}/{len(videos)}: {video.get('title', video_id)} (already downloaded)")
+            if video_id in existing_videos:
+                video_paths.append(existing_videos[video_id])
+        else:
+            videos_to_download.append((i, video))
     
-    logger.info(f"Downloaded {len(video_paths)} videos successfully")
+    # Download the remaining videos concurrently
+    semaphore = asyncio.Semaphore(max_concurrent_downloads)
+    results = await asyncio.gather(*(
+        _download_video(video, i, len(videos), output_dir, archive_path, semaphore)
+        for i, video in videos_to_download
+    ))
+    downloaded_paths = [path for path in results if path]
+    video_paths.extend(downloaded_paths)
+    
+    skipped_count = len(videos) - len(videos_to_download)
+    logger.info(f"Downloaded {len(downloaded_paths)} new videos successfully ({skipped_count} already downloaded)")
     return video_paths
 
+@lru_cache(maxsize=4096)
 def format_timestamp(seconds):
     """
-    Format seconds into a timestamp string (HH:MM:SS).
+    Format whole seconds into a timestamp string (HH:MM:SS).
     
     Args:
-        seconds (float): Time in seconds
+        seconds (int): Time in whole seconds
         
     Returns:
         str: Formatted timestamp
     """
-    hours = int(seconds / 3600)
-    minutes = int((seconds % 3600) / 60)
-    secs = int(seconds % 60)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
-def transcribe_videos(video_paths, output_dir, model_name="base"):
+def _load_audio(path, sampling_rate=16000):
     """
-    Transcribe videos using OpenAI's Whisper and save transcriptions to text files.
+    Decode the audio track of a file to mono float32 samples by piping it through ffmpeg.
+    
+    The output is read in 30s blocks, so samples are converted while ffmpeg keeps decoding.
+    
+    Args:
+        path (str): Path to the video or audio file
+        sampling_rate (int): Sampling rate of the returned samples
+        
+    Returns:
+        numpy.ndarray: Audio samples in the range [-1, 1]
+    """
+    import numpy as np
+    
+    cmd = [
+        'ffmpeg',
+        '-nostdin',
+        '-loglevel', 'error',
+        '-threads', '0',
+        '-i', path,
+        '-f', 's16le',
+        '-ac', '1',
+        '-ar', str(sampling_rate),
+        '-'
+    ]
+    block_size = 30 * sampling_rate * 2  # 30s of 16-bit samples
+    blocks = []
+    # stderr goes to a temporary file: a full stderr pipe would block ffmpeg while we wait on stdout
+    with tempfile.TemporaryFile() as stderr_file:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file) as process:
+            while True:
+                block = process.stdout.read(block_size)
+                if not block:
+                    break
+                blocks.append(np.frombuffer(block, np.int16).astype(np.float32) / 32768.0)
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace').strip()
+            raise RuntimeError(f"ffmpeg failed to decode {path}: {stderr}")
+    return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+
+def _pick_device_and_dtype(device="auto", compute_type="auto"):
+    """
+    Choose the device and CTranslate2 compute type used to run Whisper.
+    
+    On CUDA the compute type follows the GPU's compute capability: int8_float16
+    on Ampere or newer, float16 on Volta/Turing and float32 on older cards.
+    On CPU int8 is used.
+    
+    The GPU is detected through PyTorch when it is installed with CUDA support, and
+    through CTranslate2 (installed with faster-whisper) otherwise.
+    
+    Args:
+        device (str): Requested device (auto, cpu, cuda)
+        compute_type (str): Requested compute type, or "auto" to pick one
+        
+    Returns:
+        tuple: (device, compute_type)
+    """
+    capability = None
+    cuda_compute_types = None
+    if device != "cpu":
+        try:
+            import torch
+            if torch.cuda.is_available():
+                capability = torch.cuda.get_device_capability(0)
+                logger.debug(f"CUDA device: {torch.cuda.get_device_name(0)} (compute capability {capability[0]}.{capability[1]})")
+        except ImportError:
+            logger.debug("PyTorch is not installed, detecting CUDA devices through CTranslate2")
+        
+        if capability is None:
+            # No PyTorch or a CPU-only build: ask CTranslate2 directly
+            import ctranslate2
+            if ctranslate2.get_cuda_device_count() > 0:
+                cuda_compute_types = ctranslate2.get_supported_compute_types("cuda")
+                logger.debug(f"CUDA device detected by CTranslate2 (supported compute types: {', '.join(sorted(cuda_compute_types))})")
+    
+    cuda_available = capability is not None or cuda_compute_types is not None
+    if device == "auto":
+        device = "cuda" if cuda_available else "cpu"
+    elif device == "cuda" and not cuda_available:
+        logger.warning("CUDA was requested but no CUDA device was detected")
+    
+    if compute_type == "auto":
+        if device == "cpu":
+            compute_type = "int8"
+        elif capability is not None:
+            if capability >= (8, 0):
+                compute_type = "int8_float16"
+            elif capability >= (7, 0):
+                compute_type = "float16"
+            else:
+                compute_type = "float32"
+        elif cuda_compute_types is not None:
+            # Same preference order, based on what CTranslate2 supports on this GPU
+            compute_type = next(
+                (ct for ct in ("int8_float16", "float16") if ct in cuda_compute_types), "float32"
+            )
+        else:
+            # Forced CUDA without a detectable device, let CTranslate2 decide
+            compute_type = "default"
+    
+    logger.info(f"Using device: {device} (compute type: {compute_type})")
+    return device, compute_type
+
+def transcribe_videos(video_paths, output_dir, model_name="base", device="auto", compute_type="auto", vad=True,
+                      word_timestamps=False, batch_size=1):
+    """
+    Transcribe videos using faster-whisper and save transcriptions to text files.
     
     Args:
         video_paths (list): List of paths to video files
         output_dir (str): Directory where transcriptions will be saved
         model_name (str): Whisper model to use (tiny, base, small, medium, large)
+        device (str): Device to run the model on (auto, cpu, cuda)
+        compute_type (str): CTranslate2 compute type, or "auto" to pick one for the device
+        vad (bool): Skip silent regions with the Silero VAD filter before running Whisper
+        word_timestamps (bool): Compute word-level timestamps (requires an extra alignment pass)
+        batch_size (int): Number of 30s audio windows encoded together (1 disables batching)
         
     Returns:
         list: List of paths to transcription files
     """
-    # Import OpenAI's Whisper correctly
+    from tqdm import tqdm
+    from tqdm.contrib.logging import logging_redirect_tqdm
+    
+    # Import faster-whisper (CTranslate2 backend)
     try:
-        import whisper as openai_whisper
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
     except ImportError:
-        logger.warning("OpenAI Whisper is not installed. Installing the correct package...")
-        subprocess.run(["pip", "install", "openai-whisper"], check=True)
-        import whisper as openai_whisper
+        logger.warning("faster-whisper is not installed. Installing the correct package...")
+        subprocess.run(["pip", "install", "faster-whisper"], check=True)
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
     
     # Create transcription directory if it doesn't exist
     transcription_dir = os.path.join(output_dir, "transcriptions")
-    if not os.path.exists(transcription_dir):
-        os.makedirs(transcription_dir)
-        logger.info(f"Created transcription directory: {transcription_dir}")
+    os.makedirs(transcription_dir, exist_ok=True)
     
     # Load Whisper model
     logger.info(f"Loading Whisper model: {model_name}")
-    model = openai_whisper.load_model(model_name)
+    device, compute_type = _pick_device_and_dtype(device, compute_type)
+    model = WhisperModel(model_name, device=device, compute_type=compute_type)
     logger.info(f"Whisper model loaded successfully")
     
+    # Batch 30s windows of each video through the encoder when requested
+    transcriber = model
+    if batch_size > 1:
+        logger.info(f"Using batched inference with batch size {batch_size}")
+        transcriber = BatchedInferencePipeline(model=model)
+    sampling_rate = model.feature_extractor.sampling_rate
+    window_samples = model.feature_extractor.chunk_length * sampling_rate
+    
     transcription_paths = []
-    all_text_with_timestamps = ""
-    all_text_without_timestamps = ""
-    all_text_segmented = ""
-    
-    videos_to_transcribe = []
-    videos_already_transcribed = 0
-    
-    # First check which videos need transcription
-    for video_path in video_paths:
-        video_basename = os.path.basename(video_path)
-        video_name = os.path.splitext(video_basename)[0]
-        output_file = os.path.join(transcription_dir, f"{video_name}.txt")
-        output_file_segmented = os.path.join(transcription_dir, f"{video_name}_segmented.txt")
-        
-        if os.path.exists(output_file) and os.path.exists(output_file_segmented):
-            videos_already_transcribed += 1
-        else:
-            videos_to_transcribe.append(video_path)
     
-    logger.info(f"Found {videos_already_transcribed} already transcribed videos")
-    logger.info(f"Found {len(videos_to_transcribe)} videos that need transcription")
+    # Read the transcription directory once and check for existing files against this set
+    with os.scandir(transcription_dir) as entries:
+        existing_transcriptions = {entry.name for entry in entries}
     
-    # Process each video
-    for video_path in tqdm(video_paths, desc="Processing videos"):
-        try:
-            # Get base filename without extension
+    with ExitStack() as stack:
+        # Combined transcriptions are written as each video is processed
+        combined_with_timestamps = stack.enter_context(open(
+            os.path.join(transcription_dir, "combined_transcription_with_timestamps.txt"), 'w', encoding='utf-8'))
+        combined_no_timestamps = stack.enter_context(open(
+            os.path.join(transcription_dir, "combined_transcription.txt"), 'w', encoding='utf-8'))
+        combined_segmented = stack.enter_context(open(
+            os.path.join(transcription_dir, "combined_transcription_segmented.txt"), 'w', encoding='utf-8'))
+        
+        videos_to_transcribe = []
+        videos_already_transcribed = 0
+        
+        # Add already transcribed videos to the combined files and collect the ones still to do
+        for video_path in video_paths:
             video_basename = os.path.basename(video_path)
             video_name = os.path.splitext(video_basename)[0]
-            output_file = os.path.join(transcription_dir, f"{video_name}.txt")
-            output_file_no_timestamps = os.path.join(transcription_dir, f"{video_name}_no_timestamps.txt")
-            output_file_segmented = os.path.join(transcription_dir, f"{video_name}_segmented.txt")
             
-            # Skip if already transcribed
-            if os.path.exists(output_file) and os.path.exists(output_file_segmented):
-                logger.info(f"Loading existing transcription for: {video_name}")
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    file_text = f.read()
-                    all_text_with_timestamps += file_text + "\n\n"
-                with open(output_file_no_timestamps, 'r', encoding='utf-8') as f:
-                    file_text = f.read()
-                    all_text_without_timestamps += file_text + "\n\n"
-                with open(output_file_segmented, 'r', encoding='utf-8') as f:
-                    file_text = f.read()
-                    all_text_segmented += file_text + "\n\n"
-                transcription_paths.append(output_file)
+            if not (f"{video_name}.txt" in existing_transcriptions
+                    and f"{video_name}_segmented.txt" in existing_transcriptions):
+                videos_to_transcribe.append(video_path)
                 continue
             
-            logger.info(f"Transcribing: {video_name}")
-            
-            # Transcribe video with word-level timestamps
-            result = model.transcribe(video_path, word_timestamps=True)
-            
-            # Extract text without timestamps
-            transcription_text = result["text"]
-            
-            # Create text with timestamps
-            text_with_timestamps = ""
-            text_segmented = ""
-            segments = result.get("segments", [])
-            
-            for segment in segments:
-                start_time = format_timestamp(segment["start"])
-                text_with_timestamps += f"[{start_time}] {segment['text'].strip()}\n"
-                # For segmented text, just include the text without timestamps but keep line breaks
-                text_segmented += f"{segment['text'].strip()}\n"
-            
-            # Save individual transcription with timestamps
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(text_with_timestamps)
-            
-            # Save individual transcription without timestamps (full paragraph)
-            with open(output_file_no_timestamps, 'w', encoding='utf-8') as f:
-                f.write(transcription_text)
-                
-            # Save individual transcription segmented (line breaks but no timestamps)
-            with open(output_file_segmented, 'w', encoding='utf-8') as f:
-                f.write(text_segmented)
-            
-            # Add to combined text
-            all_text_with_timestamps += text_with_timestamps + "\n\n"
-            all_text_without_timestamps += transcription_text + "\n\n"
-            all_text_segmented += text_segmented + "\n\n"
-            
-            transcription_paths.append(output_file)
-            logger.info(f"Successfully transcribed: {video_name}")
-            
-        except Exception as e:
-            logger.error(f"Error transcribing video {os.path.basename(video_path)}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-    
-    # Save combined transcriptions
-    combined_file = os.path.join(transcription_dir, "combined_transcription_with_timestamps.txt")
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        f.write(all_text_with_timestamps)
-    
-    combined_file_no_timestamps = os.path.join(transcription_dir, "combined_transcription.txt")
-    with open(combined_file_no_timestamps, 'w', encoding='utf-8') as f:
-        f.write(all_text_without_timestamps)
+            try:
+                logger.info(f"Loading existing transcription for: {video_name}")
+                output_file = os.path.join(transcription_dir, f"{video_name}.txt")
+                for existing_file, combined_file in (
+                        (output_file, combined_with_timestamps),
+                        (os.path.join(transcription_dir, f"{video_name}_no_timestamps.txt"), combined_no_timestamps),
+                        (os.path.join(transcription_dir, f"{video_name}_segmented.txt"), combined_segmented)):
+                    with open(existing_file, 'r', encoding='utf-8') as f:
+                        shutil.copyfileobj(f, combined_file)
+                    combined_file.write("\n\n")
+                transcription_paths.append(output_file)
+                videos_already_transcribed += 1
+            except Exception as e:
+                logger.error(f"Error loading existing transcription for {video_basename}: {e}")
+        
+        logger.info(f"Found {videos_already_transcribed} already transcribed videos")
+        logger.info(f"Found {len(videos_to_transcribe)} videos that need transcription")
+        
+        # Route log records through tqdm.write so they don't break the progress bar
+        stack.enter_context(logging_redirect_tqdm())
         
-    combined_file_segmented = os.path.join(transcription_dir, "combined_transcription_segmented.txt")
-    with open(combined_file_segmented, 'w', encoding='utf-8') as f:
-        f.write(all_text_segmented)
+        # Decode the audio of the next video in a background thread while the current one is transcribed
+        audio_executor = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+        upcoming_videos = iter(videos_to_transcribe)
+        prefetched_audio = {}
+        
+        def prefetch_next_audio():
+            next_path = next(upcoming_videos, None)
+            if next_path is not None:
+                prefetched_audio[next_path] = audio_executor.submit(_load_audio, next_path, sampling_rate)
+        
+        prefetch_next_audio()
+        
+        # Transcribe the remaining videos
+        for video_path in tqdm(videos_to_transcribe, desc="Transcribing videos"):
+            try:
+                # Get base filename without extension
+                video_basename = os.path.basename(video_path)
+                video_name = os.path.splitext(video_basename)[0]
+                output_file = os.path.join(transcription_dir, f"{video_name}.txt")
+                output_file_no_timestamps = os.path.join(transcription_dir, f"{video_name}_no_timestamps.txt")
+                output_file_segmented = os.path.join(transcription_dir, f"{video_name}_segmented.txt")
+                
+                logger.info(f"Transcribing: {video_name}")
+                
+                # Wait for this video's audio and start decoding the next one
+                audio_future = prefetched_audio.pop(video_path, None)
+                prefetch_next_audio()
+                audio = audio_future.result() if audio_future else _load_audio(video_path, sampling_rate)
+                
+                # Transcribe video (only segment-level timestamps are written out)
+                # segments is a generator: inference only runs while it is consumed
+                transcribe_options = dict(
+                    word_timestamps=word_timestamps,
+                    vad_filter=vad,
+                    vad_parameters=dict(min_silence_duration_ms=500) if vad else None
+                )
+                if batch_size > 1:
+                    transcribe_options["batch_size"] = batch_size
+                    if not vad:
+                        # Without VAD the batched pipeline needs the windows to be given explicitly
+                        transcribe_options["clip_timestamps"] = [
+                            {"start": start, "end": min(start + window_samples, len(audio))}
+                            for start in range(0, len(audio), window_samples)
+                        ]
+                segments, info = transcriber.transcribe(audio, **transcribe_options)
+                
+                # Build all three text variants in a single pass over the segments
+                transcription_parts = []
+                timestamped_parts = []
+                segmented_parts = []
+                
+                for segment in segments:
+                    start_time = format_timestamp(int(segment.start))
+                    timestamped_parts.append(f"[{start_time}] {segment.text.strip()}\n")
+                    # For segmented text, just include the text without timestamps but keep line breaks
+                    segmented_parts.append(f"{segment.text.strip()}\n")
+                    # Full paragraph text without timestamps
+                    transcription_parts.append(segment.text)
+                
+                transcription_text = "".join(transcription_parts)
+                text_with_timestamps = "".join(timestamped_parts)
+                text_segmented = "".join(segmented_parts)
+                
+                # Save individual transcription with timestamps
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write(text_with_timestamps)
+                
+                # Save individual transcription without timestamps (full paragraph)
+                with open(output_file_no_timestamps, 'w', encoding='utf-8') as f:
+                    f.write(transcription_text)
+                    
+                # Save individual transcription segmented (line breaks but no timestamps)
+                with open(output_file_segmented, 'w', encoding='utf-8') as f:
+                    f.write(text_segmented)
+                
+                # Append to combined transcriptions
+                combined_with_timestamps.write(text_with_timestamps + "\n\n")
+                combined_no_timestamps.write(transcription_text + "\n\n")
+                combined_segmented.write(text_segmented + "\n\n")
+                
+                transcription_paths.append(output_file)
+                logger.info(f"Successfully transcribed: {video_name}")
+                
+            except Exception as e:
+                logger.error(f"Error transcribing video {os.path.basename(video_path)}: {e}")
+                import traceback
+                logger.error(traceback.format_exc())
     
     logger.info(f"Saved combined transcriptions to: {transcription_dir}")
     return transcription_paths
@@ -288,6 +521,9 @@ Examples:
   # Use a specific Whisper model
   python script.py https://www.youtube.com/playlist?list=PLAYLIST_ID --model medium
   
+  # Force running Whisper on the CPU
+  python script.py https://www.youtube.com/playlist?list=PLAYLIST_ID --device cpu
+  
   # Only download videos without transcribing
   python script.py https://www.youtube.com/playlist?list=PLAYLIST_ID --skip-transcribe
   
@@ -301,7 +537,7 @@ Examples:
   python script.py https://www.youtube.com/playlist?list=PLAYLIST_ID --debug
   
 Notes:
-  - Requires yt-dlp and openai-whisper (will attempt to install if missing)
+  - Requires yt-dlp and faster-whisper (will attempt to install if missing)
   - Transcriptions are saved in multiple formats:
     * With timestamps: video_name.txt
     * Without timestamps: video_name_no_timestamps.txt
@@ -315,6 +551,16 @@ Notes:
     parser.add_argument("--model", "-m", default="base", 
                         choices=["tiny", "tiny.en", "base", "base.en", "small", "small.en", "medium", "medium.en", "large", "turbo"],  
                         help="Whisper model to use (default: base) - larger models are more accurate but slower")
+    parser.add_argument("--device", default="auto", choices=["auto", "cpu", "cuda"],
+                        help="Device to run Whisper on (default: auto) - uses CUDA when a GPU is available")
+    parser.add_argument("--compute-type", default="auto",
+                        help="CTranslate2 compute type, e.g. int8, int8_float16, float16, float32 (default: auto)")
+    parser.add_argument("--vad", action=argparse.BooleanOptionalAction, default=True,
+                        help="Skip silent parts of the audio before transcribing (default: enabled)")
+    parser.add_argument("--word-timestamps", action="store_true",
+                        help="Compute word-level timestamps (slower, not needed for the text outputs)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Number of 30s audio windows transcribed together (default: 1) - higher values make better use of a GPU")
     parser.add_argument("--skip-download", action="store_true", 
                         help="Skip downloading videos and only transcribe existing ones")
     parser.add_argument("--skip-transcribe", action="store_true", 
@@ -336,6 +582,10 @@ Notes:
     logger.info(f"Output directory: {args.output}")
     if not args.skip_transcribe:
         logger.info(f"Whisper model: {args.model}")
+        logger.info(f"Device: {args.device} (compute type: {args.compute_type})")
+        logger.info(f"Voice activity detection: {args.vad}")
+        logger.info(f"Word timestamps: {args.word_timestamps}")
+        logger.info(f"Batch size: {args.batch_size}")
     logger.info(f"Skip download: {args.skip_download}")
     logger.info(f"Skip transcribe: {args.skip_transcribe}")
     logger.info("-----------------------------------------")
@@ -345,16 +595,22 @@ Notes:
     # Download videos if not skipped
     if not args.skip_download:
         logger.info("Starting video download process")
-        video_paths = download_playlist(args.playlist_url, args.output)
+        video_paths = asyncio.run(download_playlist(args.playlist_url, args.output))
     
-    # Get all MP4 files in the output directory
-    video_paths = glob.glob(os.path.join(args.output, "*.mp4"))
+    # Get all MP4 files in the output directory, oldest first
+    video_paths = []
+    if os.path.isdir(args.output):
+        with os.scandir(args.output) as entries:
+            video_entries = [e for e in entries if e.name.endswith('.mp4') and e.is_file()]
+        video_paths = [e.path for e in sorted(video_entries, key=lambda e: e.stat().st_mtime)]
     logger.info(f"Found {len(video_paths)} existing videos in {args.output}")
     
     # Transcribe videos
     if video_paths and not args.skip_transcribe:
         logger.info("Starting transcription process")
-        transcription_paths = transcribe_videos(video_paths, args.output, args.model)
+        transcription_paths = transcribe_videos(video_paths, args.output, args.model,
+                                                args.device, args.compute_type, args.vad,
+                                                args.word_timestamps, args.batch_size)
         logger.info(f"Transcribed {len(transcription_paths)} videos successfully")
         logger.info(f"Combined transcription files saved to the transcriptions directory:")
         logger.info(f"  - With timestamps: combined_transcription_with_timestamps.txt")